@@ -1,8 +1,12 @@
 import json
 import logging
 import os
+import random
+import threading
 import time
+from collections import OrderedDict
 from contextlib import contextmanager
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Self, Tuple, Union
 
@@ -10,7 +14,6 @@ from ape import Contract, accounts, networks
 from ape.contracts import ContractInstance
 from ape.exceptions import NetworkError
 from ape_accounts.accounts import InvalidPasswordError
-from giza.cli import API_HOST
 from giza.cli.client import AgentsClient, EndpointsClient, JobsClient, ProofsClient
 from giza.cli.schemas.agents import Agent, AgentList, AgentUpdate
 from giza.cli.schemas.jobs import Job, JobList
@@ -19,10 +22,35 @@ from giza.cli.utils.enums import JobKind, JobStatus
 from requests import HTTPError
 
 from giza.agents.model import GizaModel
-from giza.agents.utils import read_json
+from giza.agents.utils import create_client, read_json
 
 logger = logging.getLogger(__name__)
 
+# Jobs of an endpoint indexed by request ID, shared by all the AgentResults
+_JOBS_INDEX_TTL = 60.0
+_JOBS_INDEX: Dict[int, Tuple[float, Dict[str, Job]]] = {}
+_JOBS_INDEX_LOCK = threading.Lock()
+
+# Proofs are immutable once issued, keep the latest ones by endpoint and request ID
+_PROOF_CACHE_SIZE = 1024
+_PROOF_CACHE: "OrderedDict[Tuple[int, str], Proof]" = OrderedDict()
+_PROOF_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _load_abi(path: str) -> List[Dict[str, Any]]:
+    """
+    Load and parse a JSON ABI file, caching the result by path.
+
+    Args:
+        path (str): The absolute path to the ABI file.
+
+    Returns:
+        The parsed ABI.
+    """
+    abi: List[Dict[str, Any]] = read_json(path)
+    return abi
+
 
 class GizaAgent(GizaModel):
     """
@@ -48,7 +76,9 @@ class GizaAgent(GizaModel):
             **kwargs: Additional keyword arguments.
         """
         super().__init__(id=id, version=version_id)
-        self._agents_client = kwargs.pop("agents_client", AgentsClient(API_HOST))
+        self._agents_client = kwargs.pop("agents_client", None) or create_client(
+            AgentsClient
+        )
         self._agent = self._retrieve_agent_info(self._agents_client)
 
         # Here we try to get the info from the agent in Giza if not provided
@@ -70,12 +100,18 @@ class GizaAgent(GizaModel):
         self._check_or_create_account()
 
         # Useful for testing
-        network_parser: Callable = kwargs.get(
+        self._network_parser: Callable = kwargs.get(
             "network_parser", networks.parse_network_choice
         )
 
+    @cached_property
+    def _provider(self) -> Any:
+        """
+        The provider context of the agent's chain, resolved on first use so that
+        creating an agent does not need to reach the network.
+        """
         try:
-            self._provider = network_parser(self.chain)
+            return self._network_parser(self.chain)
         except NetworkError:
             logger.error(f"Chain {self.chain} not found")
             raise ValueError(f"Chain {self.chain} not found")
@@ -93,7 +129,7 @@ class GizaAgent(GizaModel):
         Create an agent from an ID.
         """
 
-        client: AgentsClient = kwargs.pop("client", AgentsClient(API_HOST))
+        client: AgentsClient = kwargs.pop("client", None) or create_client(AgentsClient)
         try:
             agent: Agent = client.get(id)
         except HTTPError as e:
@@ -205,12 +241,33 @@ class GizaAgent(GizaModel):
         if self.account is None:
             raise ValueError("Account is not specified.")
 
-        if f"{self.account.upper()}_PASSPHRASE" not in os.environ:
+        self.validate_accounts([self.account])
+
+    @classmethod
+    def validate_accounts(cls, accounts: List[str]) -> None:
+        """
+        Check that the passphrases of all the accounts are in the environment variables.
+
+        Useful to validate every account up front before creating several agents.
+
+        Args:
+            accounts (List[str]): The accounts to check.
+
+        Raises:
+            ValueError: If any of the passphrases is missing, listing all the missing accounts.
+        """
+        missing = [
+            account
+            for account in accounts
+            if f"{account.upper()}_PASSPHRASE" not in os.environ
+        ]
+        for account in missing:
             logger.error(
-                f"Passphrase for account {self.account} not found in environment variables. Passphrase must be stored in an environment variable named {self.account.upper()}_PASSPHRASE."
+                f"Passphrase for account {account} not found in environment variables. Passphrase must be stored in an environment variable named {account.upper()}_PASSPHRASE."
             )
+        if missing:
             raise ValueError(
-                f"Passphrase for account {self.account} not found in environment variables"
+                f"Passphrase for account {', '.join(missing)} not found in environment variables"
             )
 
     @contextmanager
@@ -310,9 +367,9 @@ class AgentResult:
         request_id: str,
         result: Any,
         agent: GizaAgent,
-        endpoint_client: EndpointsClient = EndpointsClient(API_HOST),
-        jobs_client: JobsClient = JobsClient(API_HOST),
-        proofs_client: ProofsClient = ProofsClient(API_HOST),
+        endpoint_client: Optional[EndpointsClient] = None,
+        jobs_client: Optional[JobsClient] = None,
+        proofs_client: Optional[ProofsClient] = None,
         **kwargs: Any,
     ):
         """
@@ -325,9 +382,9 @@ class AgentResult:
         self.request_id: str = request_id
         self.__value: Any = result
         self.verified: bool = False
-        self._endpoint_client = endpoint_client
-        self._jobs_client = jobs_client
-        self._proofs_client = proofs_client
+        self._endpoint_client = endpoint_client or create_client(EndpointsClient)
+        self._jobs_client = jobs_client or create_client(JobsClient)
+        self._proofs_client = proofs_client or create_client(ProofsClient)
         self._endpoint_id = agent.endpoint_id
         self._framework = agent.framework
         self._model_id = agent.model_id
@@ -335,6 +392,7 @@ class AgentResult:
         self._verify_job: Optional[Job] = None
         self._timeout: int = kwargs.get("timeout", 600)
         self._poll_interval: int = kwargs.get("poll_interval", 10)
+        self._backoff_base: float = kwargs.get("backoff_base", 0.5)
         self._proof: Proof = None
         self._dry_run: bool = kwargs.get("dry_run", False)
 
@@ -347,12 +405,27 @@ class AgentResult:
     def _get_proof_job(self, client: EndpointsClient) -> Job:
         """
         Get the proof job.
+
+        The jobs of the endpoint are indexed by request ID and kept for a short time,
+        so results of the same endpoint only list the jobs again when the request ID is
+        not already known.
         """
+        now = time.monotonic()
+        with _JOBS_INDEX_LOCK:
+            cached = _JOBS_INDEX.get(self._endpoint_id)
+        if cached is not None and cached[0] > now and self.request_id in cached[1]:
+            return cached[1][self.request_id]
 
         jobs: JobList = client.list_jobs(self._endpoint_id)
-        for job in jobs.root:
-            if job.request_id == self.request_id:
-                return job
+        index = {job.request_id: job for job in jobs.root if job.request_id}
+        with _JOBS_INDEX_LOCK:
+            for endpoint_id, (expiry, _) in list(_JOBS_INDEX.items()):
+                if expiry <= now:
+                    del _JOBS_INDEX[endpoint_id]
+            _JOBS_INDEX[self._endpoint_id] = (now + _JOBS_INDEX_TTL, index)
+
+        if self.request_id in index:
+            return index[self.request_id]
         raise ValueError(f"Proof job for request ID {self.request_id} not found")
 
     @property
@@ -382,11 +455,24 @@ class AgentResult:
     ) -> None:
         """
         Wait for the proof job to finish.
+
+        If the proof was already retrieved for this request there is nothing to wait for.
         """
+        key = (self._endpoint_id, self._proof_job.request_id)
+        with _PROOF_CACHE_LOCK:
+            if key in _PROOF_CACHE:
+                _PROOF_CACHE.move_to_end(key)
+                self._proof = _PROOF_CACHE[key]
+                return
+
         self._wait_for(self._proof_job, client, timeout, poll_interval, JobKind.PROOF)
         self._proof = self._endpoint_client.get_proof(
             self._endpoint_id, self._proof_job.request_id
         )
+        with _PROOF_CACHE_LOCK:
+            _PROOF_CACHE[key] = self._proof
+            if len(_PROOF_CACHE) > _PROOF_CACHE_SIZE:
+                _PROOF_CACHE.popitem(last=False)
 
     def _verify_proof(self, client: EndpointsClient) -> bool:
         """
@@ -411,22 +497,28 @@ class AgentResult:
         """
         Wait for a job to finish.
 
+        The job is polled with an exponential backoff with jitter, starting at
+        `backoff_base` seconds and capped at `poll_interval`, so jobs that finish
+        quickly are picked up without waiting a full poll interval.
+
         Args:
             job (Job): The job to wait for.
             client (JobsClient): The client to use.
             timeout (int): The timeout.
-            poll_interval (int): The poll interval.
+            poll_interval (int): The maximum poll interval.
             kind (JobKind): The kind of job.
 
         Raises:
             ValueError: If the job failed.
             TimeoutError: If the job timed out.
         """
-        start_time = time.time()
+        start_time = time.monotonic()
         wait_timeout = start_time + float(timeout)
+        attempt = 0
+        polled = False
 
         while True:
-            now = time.time()
+            now = time.monotonic()
             if job.status == JobStatus.COMPLETED:
                 logger.info(f"{str(kind).capitalize()} job completed")
                 return
@@ -436,12 +528,29 @@ class AgentResult:
             elif now > wait_timeout:
                 logger.error(f"{str(kind).capitalize()} job timed out")
                 raise TimeoutError(f"{str(kind).capitalize()} job timed out")
-            else:
-                job = client.get(job.id, params={"kind": kind})
+            elif polled:
+                # Only sleep once the status has been refreshed, the given job may be stale
                 logger.info(
                     f"{str(kind).capitalize()} job is still running, elapsed time: {now - start_time}"
                 )
-            time.sleep(poll_interval)
+                time.sleep(self._backoff_delay(attempt, poll_interval))
+                attempt += 1
+            job = client.get(job.id, params={"kind": kind})
+            polled = True
+
+    def _backoff_delay(self, attempt: int, poll_interval: float) -> float:
+        """
+        Compute the delay before the next poll.
+
+        Args:
+            attempt (int): The number of polls already made.
+            poll_interval (float): The maximum delay between polls.
+
+        Returns:
+            The delay in seconds, with a random jitter of up to half the delay.
+        """
+        delay = min(float(poll_interval), self._backoff_base * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
 
 
 class ContractHandler:
@@ -467,17 +576,26 @@ class ContractHandler:
     ) -> ContractInstance:
         """
         Initiate the contract.
+
+        ABI files are parsed once and reused on later executions.
         """
         if not abi:
             return Contract(address=address)
+        if "{" not in abi and Path(abi).is_file():
+            return Contract(address=address, abi=_load_abi(str(Path(abi).resolve())))
         return Contract(address=address, abi=abi)
 
     def handle(self) -> Self:
         """
         Handle the contracts.
+
+        Contracts already initiated by a previous call are reused, the handler is bound
+        to a single chain so the instances stay valid across executions.
         """
         try:
             for name, contract_data in self._contracts.items():
+                if name in self._contracts_instances:
+                    continue
                 if isinstance(contract_data, str):
                     address = contract_data
                     self._contracts_instances[name] = self._initiate_contract(address)
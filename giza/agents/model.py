@@ -1,15 +1,23 @@
+import io
 import logging
 import os
+import queue
 import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import onnx
 import onnxruntime as ort
+import orjson
 import requests
 from diskcache import Cache
-from giza.cli import API_HOST
 from giza.cli.client import ApiClient, EndpointsClient, ModelsClient, VersionsClient
 from giza.cli.schemas.models import Model
 from giza.cli.schemas.versions import Version
@@ -25,10 +33,489 @@ from osiris.app import (
 if TYPE_CHECKING:
     from giza.agents import AgentResult
 
-from giza.agents.utils import get_endpoint_uri
+from giza.agents.utils import create_client, get_endpoint_uri, get_session
 
 logger = logging.getLogger(__name__)
 
+# Sessions by model path, file version and thread count, so models loaded more than once
+# share the prepared session
+_SESSION_CACHE_SIZE = 8
+_SESSION_CACHE: "OrderedDict[Tuple[str, int, int, int], ort.InferenceSession]" = (
+    OrderedDict()
+)
+_SESSION_CACHE_LOCK = threading.Lock()
+
+
+def _reset_session_cache() -> None:
+    """
+    Drops the sessions inherited from the parent process after a fork, sessions are not
+    fork safe and each child has to create its own ones.
+    """
+    global _SESSION_CACHE_LOCK
+    _SESSION_CACHE_LOCK = threading.Lock()
+    _SESSION_CACHE.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session_cache)
+
+
+# Cairo felts live in this prime field, negative integers wrap around it
+_PRIME_FIELD = 2**251 + 17 * 2**192 + 1
+_FP_FRACTION_BITS = {"FP16x16": 16, "FP8x23": 23, "FP32x32": 32, "FP64x64": 64}
+_FP_BUFFERS = threading.local()
+
+
+def _felt_tokens(ints: np.ndarray) -> np.ndarray:
+    """
+    Converts an integer array to its Cairo felt representation as strings.
+
+    Args:
+        ints (np.ndarray): The flat integer array.
+
+    Returns:
+        The felt of each integer as a string array.
+    """
+    tokens = ints.astype(str)
+    negative = ints < 0
+    if negative.any():
+        tokens = tokens.astype(object)
+        tokens[negative] = [str(_PRIME_FIELD + n) for n in ints[negative].tolist()]
+    return tokens
+
+
+def _nested_tokens(tokens: np.ndarray) -> str:
+    """
+    Joins the tokens of an array as nested Cairo arrays, one level per dimension.
+    """
+    if tokens.ndim <= 1:
+        return f"[{' '.join(tokens.tolist())}]"
+    return f"[{' '.join(_nested_tokens(row) for row in tokens)}]"
+
+
+def _fixed_point_buffers(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retrieves the scratch buffers of the fixed point conversion for `size` values.
+
+    The buffers are kept per thread and reused while consecutive inputs have the same
+    size, so repeated predictions do not allocate them again.
+
+    Args:
+        size (int): The number of values to convert.
+
+    Returns:
+        The float64 buffer for the scaled magnitudes and the int64 buffer of
+        (magnitude, sign) pairs.
+    """
+    buffers = getattr(_FP_BUFFERS, "buffers", None)
+    if buffers is None or buffers[0].size != size:
+        buffers = (
+            np.empty(size, dtype=np.float64),
+            np.empty((size, 2), dtype=np.int64),
+        )
+        _FP_BUFFERS.buffers = buffers
+    return buffers
+
+
+def _serialize_fixed_point(value: np.ndarray, fp_impl: str) -> str:
+    """
+    Serializes an array as an Orion tensor, vectorized equivalent of
+    `serializer(create_tensor_from_array(value, fp_impl))`.
+
+    Falls back to osiris for the inputs that can not be converted exactly with int64
+    arithmetic (non numeric dtypes, non finite values or magnitudes out of range).
+
+    Args:
+        value (np.ndarray): The array to serialize.
+        fp_impl (str): The fixed point implementation to use for floats.
+
+    Returns:
+        The serialized tensor, its shape followed by its data.
+    """
+    flat = value.ravel()
+    shape = " ".join(str(dim) for dim in value.shape)
+
+    if flat.dtype.kind in "iu":
+        return f"[{shape}] [{' '.join(_felt_tokens(flat).tolist())}]"
+
+    bits = _FP_FRACTION_BITS.get(fp_impl)
+    if flat.dtype.kind == "f" and bits is not None:
+        scaled, fixed_point = _fixed_point_buffers(flat.size)
+        np.abs(flat, out=scaled)
+        np.multiply(scaled, 2.0**bits, out=scaled)
+        np.trunc(scaled, out=scaled)
+        # A nan or inf anywhere propagates to the max
+        top = scaled.max() if flat.size else 0.0
+        if np.isfinite(top) and top < 2.0**63:
+            fixed_point[:, 0] = scaled
+            np.less(flat, 0, out=fixed_point[:, 1])
+            return f"[{shape}] [{' '.join(fixed_point.ravel().astype(str).tolist())}]"
+
+    return serializer(create_tensor_from_array(value, fp_impl))
+
+
+def _serialize_integers(value: np.ndarray) -> str:
+    """
+    Serializes an integer array as nested Cairo arrays of felts, vectorized equivalent
+    of `serializer(value)`.
+
+    Args:
+        value (np.ndarray): The integer array to serialize.
+
+    Returns:
+        The serialized array.
+    """
+    if value.ndim == 0:
+        return str(_felt_tokens(value.reshape(1))[0])
+    return _nested_tokens(_felt_tokens(value.ravel()).reshape(value.shape))
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Converts the numpy values orjson can not serialize natively: subclasses such as
+    memmap, non contiguous arrays and unsupported dtypes.
+
+    Args:
+        obj (Any): The object orjson failed to serialize.
+
+    Returns:
+        A value orjson can serialize.
+
+    Raises:
+        TypeError: If the object is not a numpy value.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.ndim == 0:
+            return obj.item()
+        array = np.ascontiguousarray(obj)
+        if type(obj) is np.ndarray and array is obj:
+            # Already a plain contiguous array, so the dtype is not supported
+            return obj.tolist()
+        return array.view(np.ndarray)
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _native_byte_order(obj: Any) -> Any:
+    """
+    Converts the numpy arrays in a payload that are not in the native byte order, orjson
+    writes their raw bytes as if they were.
+
+    Args:
+        obj (Any): The payload, or a value in it.
+
+    Returns:
+        The value with its arrays in the native byte order.
+    """
+    if isinstance(obj, np.ndarray):
+        if obj.dtype.isnative:
+            return obj
+        return obj.astype(obj.dtype.newbyteorder("="))
+    if isinstance(obj, dict):
+        return {key: _native_byte_order(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)) and any(
+        isinstance(item, (np.ndarray, dict, list, tuple)) for item in obj
+    ):
+        return [_native_byte_order(item) for item in obj]
+    return obj
+
+
+def _dumps_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    Serializes a prediction request payload, writing numpy arrays directly instead of
+    converting them to lists first.
+
+    Args:
+        payload (Dict[str, Any]): The payload of the prediction request.
+
+    Returns:
+        The JSON encoded payload.
+    """
+    return orjson.dumps(
+        _native_byte_order(payload),
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+# The credentials file is only read when the clients are created, so they are rebuilt
+# after this many seconds to pick up a new login
+_API_CLIENTS_TTL = 15 * 60.0
+_api_clients_deadline = 0.0
+
+
+@lru_cache(maxsize=None)
+def _api_clients() -> Tuple[ModelsClient, VersionsClient, ApiClient, EndpointsClient]:
+    """
+    Retrieves the API clients shared by all the models, creating them on first use.
+
+    The clients are kept for `_API_CLIENTS_TTL` seconds, `GizaModel._get_credentials`
+    clears the cache earlier when the token is expired or missing.
+
+    Returns:
+        The models, versions, general and endpoints clients.
+    """
+    global _api_clients_deadline
+    _api_clients_deadline = time.monotonic() + _API_CLIENTS_TTL
+    return (
+        create_client(ModelsClient),
+        create_client(VersionsClient),
+        create_client(ApiClient),
+        create_client(EndpointsClient),
+    )
+
+
+def _session_options() -> ort.SessionOptions:
+    """
+    Builds the onnxruntime session options used for local inference.
+
+    Returns:
+        The session options, with all graph optimizations and memory pattern planning enabled.
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.enable_mem_pattern = True
+    options.enable_cpu_mem_arena = True
+    return options
+
+
+def _get_session(
+    model_path: str, share_weights: bool = False, intra_op_num_threads: int = 0
+) -> ort.InferenceSession:
+    """
+    Retrieves the onnxruntime session for a model, creating it on first use or when the
+    file changed since the cached session was created.
+
+    Args:
+        model_path (str): The file path to the ONNX model.
+        share_weights (bool): Run the weights directly from their memory mapped external data
+            file instead of repacking them in private memory. Defaults to False.
+        intra_op_num_threads (int): The number of threads running each operator, 0 lets onnxruntime
+            use all the cores. Defaults to 0.
+
+    Returns:
+        The inference session for the model.
+    """
+    stat = os.stat(model_path)
+    key = (model_path, stat.st_mtime_ns, stat.st_size, intra_op_num_threads)
+    with _SESSION_CACHE_LOCK:
+        if key in _SESSION_CACHE:
+            _SESSION_CACHE.move_to_end(key)
+            return _SESSION_CACHE[key]
+        # Sessions of previous versions of the file are never used again
+        stale = [k for k in _SESSION_CACHE if k[0] == model_path and k[1:3] != key[1:3]]
+        for k in stale:
+            del _SESSION_CACHE[k]
+
+    available = ort.get_available_providers()
+    providers = [
+        provider
+        for provider in ("CUDAExecutionProvider", "CPUExecutionProvider")
+        if provider in available
+    ]
+    options = _session_options()
+    options.intra_op_num_threads = intra_op_num_threads
+    if share_weights:
+        # Prepacking copies the weights out of the mapped file
+        options.add_session_config_entry("session.disable_prepacking", "1")
+    session = ort.InferenceSession(
+        model_path, sess_options=options, providers=providers
+    )
+
+    with _SESSION_CACHE_LOCK:
+        _SESSION_CACHE[key] = session
+        if len(_SESSION_CACHE) > _SESSION_CACHE_SIZE:
+            _SESSION_CACHE.popitem(last=False)
+    return session
+
+
+def _is_outdated(derived_path: Path, source_path: Path) -> bool:
+    """
+    Checks whether a file derived from a model has to be written again, because it is missing
+    or the model was modified after it.
+
+    Args:
+        derived_path (Path): The file written from the model.
+        source_path (Path): The file path to the ONNX model.
+
+    Returns:
+        True if the derived file is missing or older than the model.
+    """
+    if not derived_path.exists():
+        return True
+    return derived_path.stat().st_mtime_ns < source_path.stat().st_mtime_ns
+
+
+def _quantize_model(model_path: str) -> str:
+    """
+    Writes the int8 dynamically quantized variant of a model next to the original one, on
+    first use and whenever the original is modified.
+
+    Args:
+        model_path (str): The file path to the ONNX model.
+
+    Returns:
+        The file path to the quantized model.
+    """
+    # Imported here as it noticeably slows down importing the package
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    path = Path(model_path)
+    quantized_path = path.with_name(f"{path.stem}.int8.onnx")
+    if _is_outdated(quantized_path, path):
+        tmp_path = path.with_name(f"{path.stem}.int8.tmp.onnx")
+        quantize_dynamic(path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, quantized_path)
+        logger.info(f"Quantized model saved at: {quantized_path} ✅")
+    return str(quantized_path)
+
+
+def _externalize_weights(model_path: str) -> str:
+    """
+    Writes a copy of a model with its weights in an external data file next to the original
+    one, on first use and whenever the original is modified.
+
+    onnxruntime memory maps external data, so the weights are backed by the page cache and
+    shared by every process loading the model, including forked workers. Each version gets
+    its own data file, as the previous one may still be mapped by running processes.
+
+    Args:
+        model_path (str): The file path to the ONNX model.
+
+    Returns:
+        The file path to the model with external weights.
+    """
+    path = Path(model_path)
+    shared_path = path.with_name(f"{path.stem}.shared.onnx")
+    if _is_outdated(shared_path, path):
+        data_name = f"{shared_path.stem}.{path.stat().st_mtime_ns}.data"
+        tmp_path = path.with_name(f"{path.stem}.shared.tmp.onnx")
+        onnx.save_model(
+            onnx.load(path),
+            tmp_path,
+            save_as_external_data=True,
+            all_tensors_to_one_file=True,
+            location=data_name,
+        )
+        os.replace(tmp_path, shared_path)
+        # Mapped pages outlive the file, so running processes keep working
+        for old_data in path.parent.glob(f"{shared_path.stem}.*.data"):
+            if old_data.name != data_name:
+                old_data.unlink()
+        logger.info(f"Model with external weights saved at: {shared_path} ✅")
+    return str(shared_path)
+
+
+class _LocalBindings(threading.local):
+    """
+    The IOBinding of a local session and the inputs bound to it, kept per thread so
+    concurrent predictions do not share bindings.
+    """
+
+    def __init__(self) -> None:
+        self.io_binding: Optional[ort.IOBinding] = None
+        self.input_values: Dict[str, ort.OrtValue] = {}
+        self.bound_signature: Optional[Tuple] = None
+        self.static_outputs = False
+
+
+class _BatchDispatcher:
+    """
+    Groups the input feeds of concurrent local predictions into a single session run.
+
+    Requests are accumulated until `max_batch_size` feeds are queued or `max_batch_delay`
+    seconds have passed since the first one, then concatenated along the first axis, run
+    once and the outputs are scattered back to each caller. The model must accept a
+    dynamic batch dimension. The worker thread runs until `close` is called.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[Dict], np.ndarray],
+        max_batch_size: int,
+        max_batch_delay: float,
+    ) -> None:
+        self._run = run
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        self._queue: "queue.Queue[Optional[Tuple[Dict, Future]]]" = queue.Queue()
+        self._worker = threading.Thread(target=self._loop, daemon=True)
+        self._worker.start()
+
+    def submit(self, input_feed: Dict) -> Future:
+        """
+        Queues an input feed for the next batch.
+
+        Args:
+            input_feed (Dict): A dictionary with the input name as key and the array as value.
+
+        Returns:
+            A future that resolves to the output rows of this feed.
+        """
+        future: Future = Future()
+        self._queue.put((input_feed, future))
+        return future
+
+    @property
+    def settings(self) -> Tuple[int, float]:
+        """
+        The maximum batch size and delay, in seconds, of the dispatcher.
+        """
+        return (self._max_batch_size, self._max_batch_delay)
+
+    def close(self) -> None:
+        """
+        Stops the worker thread, once the feeds already queued are dispatched.
+        """
+        self._queue.put(None)
+        if threading.current_thread() is not self._worker:
+            self._worker.join()
+
+    def _loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            items = [item]
+            stop = False
+            deadline = time.monotonic() + self._max_batch_delay
+            while len(items) < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                items.append(item)
+            self._dispatch(items)
+            if stop:
+                return
+
+    def _dispatch(self, items: List[Tuple[Dict, Future]]) -> None:
+        try:
+            names = items[0][0].keys()
+            batch = {
+                name: np.concatenate([feed[name] for feed, _ in items], axis=0)
+                for name in names
+            }
+            preds = self._run(batch)
+        except Exception as e:
+            logger.error(f"An error occurred in batched predict: {e}")
+            for _, future in items:
+                future.set_exception(e)
+            return
+
+        offset = 0
+        for feed, future in items:
+            rows = len(next(iter(feed.values())))
+            future.set_result(preds[offset : offset + rows])
+            offset += rows
+
 
 class GizaModel:
     """
@@ -49,6 +536,10 @@ class GizaModel:
         id (Optional[int]): The unique identifier of the model in the Giza platform. Defaults to None.
         version (Optional[int]): The version number of the model in the Giza platform. Defaults to None.
         output_path (Optional[str]): The file path where the downloaded model should be saved. Defaults to None.
+        quantize (bool): Run local predictions on an int8 dynamically quantized copy of the model, faster
+            but less precise. Verifiable predictions are not affected. Defaults to False.
+        share_weights (bool): Run local predictions from a copy of the model with memory mapped external
+            weights, shared by all the processes serving it. Defaults to False.
 
     Raises:
         ValueError: If the necessary combination of parameters is not provided.
@@ -60,6 +551,8 @@ class GizaModel:
         id: Optional[int] = None,
         version: Optional[int] = None,
         output_path: Optional[str] = None,
+        quantize: bool = False,
+        share_weights: bool = False,
     ):
         if model_path is None and id is None and version is None:
             raise ValueError("Either model_path or id and version must be provided.")
@@ -75,33 +568,98 @@ class GizaModel:
                 "Only one of model_path or id and version should be provided."
             )
 
+        self._bindings = _LocalBindings()
+        self._batcher: Optional[_BatchDispatcher] = None
+        self._batcher_finalizer: Optional[weakref.finalize] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_workers: Optional[int] = None
+        self._pool_session: Optional[ort.InferenceSession] = None
+        self._pool_bindings = _LocalBindings()
+        self._model_file: Optional[str] = None
+        self._quantize = quantize
+        self._share_weights = share_weights
+
         if model_path:
             if ".onnx" in model_path:
-                self.session = ort.InferenceSession(model_path)
+                self.session = self._load_session(model_path)
             # TODO (@alejandromartinezgotor): if ".json" in model_path create session for non-verifiable inference.
         elif id and version:
             self.model_id = id
             self.version_id = version
-            self.model_client = ModelsClient(API_HOST)
-            self.version_client = VersionsClient(API_HOST)
-            self.api_client = ApiClient(API_HOST)
-            self.endpoints_client = EndpointsClient(API_HOST)
+            (
+                self.model_client,
+                self.version_client,
+                self.api_client,
+                self.endpoints_client,
+            ) = _api_clients()
             self._get_credentials()
-            self.model = self._get_model(id)
-            self.version = self._get_version(version)
-            self.framework = self.version.framework
-            self.uri = self._retrieve_uri()
-            self.endpoint_id = self._get_endpoint_id()
-            self._cache = Cache(os.path.join(os.getcwd(), "tmp", "cachedir"))
-            self.session = self._set_session()
-            if output_path is not None:
-                self._output_path = output_path
-            else:
-                self._output_path = os.path.join(
-                    tempfile.gettempdir(),
-                    f"{self.model_id}_{self.version_id}_{self.model.name}",
-                )
-            self._download_model()
+            # Independent requests are sent concurrently, in two rounds
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                model_future = executor.submit(self._get_model, id)
+                version_future = executor.submit(self._get_version, version)
+                self.model = model_future.result()
+                self.version = version_future.result()
+                self.framework = self.version.framework
+                self._format_inputs = self._get_inputs_formatter()
+                self._cache = Cache(os.path.join(os.getcwd(), "tmp", "cachedir"))
+                if output_path is not None:
+                    self._output_path = output_path
+                else:
+                    self._output_path = os.path.join(
+                        tempfile.gettempdir(),
+                        f"{self.model_id}_{self.version_id}_{self.model.name}",
+                    )
+                uri_future = executor.submit(self._retrieve_uri)
+                endpoint_id_future = executor.submit(self._get_endpoint_id)
+                session_future = executor.submit(self._set_session)
+                self.uri = uri_future.result()
+                self.endpoint_id = endpoint_id_future.result()
+                self.session = session_future.result()
+
+    @classmethod
+    def from_shared(cls, model_path: str, quantize: bool = False) -> "GizaModel":
+        """
+        Loads a local model with its weights memory mapped, so the processes of a preforked
+        prediction server share a single copy of them instead of loading one per worker.
+
+        Cached sessions are dropped in forked children, so a model created in a worker after
+        the fork gets its own session, while the weights it reads stay shared through the
+        page cache.
+
+        Args:
+            model_path (str): The file path to a local ONNX model.
+            quantize (bool): Share the int8 dynamically quantized copy of the model. Defaults to False.
+
+        Returns:
+            The model, with a session reading its weights from the shared mapping.
+        """
+        return cls(model_path=model_path, quantize=quantize, share_weights=True)
+
+    def _load_session(
+        self, model_path: str, intra_op_num_threads: int = 0
+    ) -> ort.InferenceSession:
+        """
+        Loads the onnxruntime session for a local model file, applying the quantization and
+        weight sharing settings of the model.
+
+        Args:
+            model_path (str): The file path to the ONNX model.
+            intra_op_num_threads (int): The number of threads running each operator, 0 lets onnxruntime
+                use all the cores. Defaults to 0.
+
+        Returns:
+            The inference session for the model.
+        """
+        self._model_file = model_path
+        if self._quantize:
+            model_path = _quantize_model(model_path)
+        if self._share_weights:
+            return _get_session(
+                _externalize_weights(model_path),
+                share_weights=True,
+                intra_op_num_threads=intra_op_num_threads,
+            )
+        return _get_session(model_path, intra_op_num_threads=intra_op_num_threads)
 
     def _get_endpoint_id(self) -> int:
         """
@@ -164,7 +722,7 @@ class GizaModel:
         Returns:
             The version of the model.
         """
-        return self.version_client.get(self.model.id, version_id)
+        return self.version_client.get(self.model_id, version_id)
 
     def _set_session(self) -> Optional[ort.InferenceSession]:
         """
@@ -179,18 +737,14 @@ class GizaModel:
                 f"Model version status is not completed {self.version.status}"
             )
 
-        try:
-            self._download_model()
-
-            if self._output_path in self._cache:
-                file_path = Path(self._cache.get(self._output_path))
-                with open(file_path, "rb") as f:
-                    onnx_model = f.read()
+        self._download_model()
 
-            return ort.InferenceSession(onnx_model)
+        try:
+            file_path = Path(self._cache.get(self._output_path))
+            return self._load_session(str(file_path))
 
         except Exception as e:
-            logger.info(f"Could not download model: {e}")
+            logger.info(f"Could not load model: {e}")
             return None
 
     def _download_model(self) -> None:
@@ -233,9 +787,32 @@ class GizaModel:
     def _get_credentials(self) -> None:
         """
         Retrieves and sets the necessary credentials for API access.
+
+        The clients are shared, so this is skipped once valid credentials were retrieved
+        by a previous model. The clients are rebuilt, reading the credentials again, when
+        their TTL elapsed or the token expired.
         """
-        self.api_client.retrieve_token()
-        self.api_client.retrieve_api_key()
+        api_client = self.api_client
+        if time.monotonic() >= _api_clients_deadline or (
+            api_client.api_key is None
+            and api_client.token is not None
+            and api_client._is_expired(api_client.token)
+        ):
+            _api_clients.cache_clear()
+            (
+                self.model_client,
+                self.version_client,
+                self.api_client,
+                self.endpoints_client,
+            ) = _api_clients()
+            api_client = self.api_client
+        if api_client.token is not None or api_client.api_key is not None:
+            return
+        api_client.retrieve_token()
+        api_client.retrieve_api_key()
+        if api_client.token is None and api_client.api_key is None:
+            # Not logged in yet, let the next model read the credentials again
+            _api_clients.cache_clear()
 
     def predict(
         self,
@@ -247,6 +824,7 @@ class GizaModel:
         model_category="ONNX_ORION",
         job_size: str = "M",
         dry_run: bool = False,
+        out: Optional[np.ndarray] = None,
     ) -> Optional[Union[Tuple[Any, Any], "AgentResult"]]:
         """
         Makes a prediction using either a local ONNX session or a remote deployed model, depending on the
@@ -259,6 +837,8 @@ class GizaModel:
             fp_impl (str): The fixed point implementation to use, when computed in verifiable mode. Defaults to "FP16x16".
             custom_output_dtype (Optional[str]): Specify the data type of the result when computed in verifiable mode. Defaults to None.
             model_category (str): The category of model. "ONNX_ORION" | "XGB" | "LGBM"
+            out (Optional[np.ndarray]): A C contiguous array the local prediction is written into, to reuse
+                it across calls instead of allocating a new one. Defaults to None.
 
         Returns:
             A tuple (predictions, request_id) where predictions is the result of the prediction and request_id
@@ -275,7 +855,7 @@ class GizaModel:
                     raise ValueError("Model has not been deployed")
 
                 # Non common arguments should be named parameters
-                payload = self._format_inputs_for_framework(
+                payload = self._format_inputs(
                     input_file,
                     input_feed,
                     fp_impl=fp_impl,
@@ -286,7 +866,11 @@ class GizaModel:
                 if dry_run:
                     payload["dry_run"] = True
 
-                response = requests.post(self.uri, json=payload)
+                response = get_session().post(
+                    self.uri,
+                    data=_dumps_payload(payload),
+                    headers={"Content-Type": "application/json"},
+                )
 
                 try:
                     response.raise_for_status()
@@ -296,7 +880,7 @@ class GizaModel:
                     logger.error(error_message)
                     raise e
 
-                body = response.json()
+                body = orjson.loads(response.content)
                 serialized_output = body["result"]
                 request_id = body["request_id"]
 
@@ -326,25 +910,220 @@ class GizaModel:
                     raise ValueError("Session is not initialized.")
                 if input_feed is None:
                     raise ValueError("Input feed is none")
-                preds = self.session.run(None, input_feed)[0]
+                preds = self._run_session(input_feed, out=out)
                 return (preds, None)
         except Exception as e:
             logger.error(f"An error occurred in predict: {e}")
             raise e
 
-    def _format_inputs_for_framework(self, *args: Any, **kwargs: Any) -> Any:
+    def predict_batched(
+        self,
+        input_feed: Dict,
+        max_batch_size: int = 32,
+        max_batch_delay_ms: float = 2.0,
+    ) -> Future:
+        """
+        Makes a local prediction batched together with the ones requested concurrently, so
+        a single session run serves several callers.
+
+        The inputs of every feed must share all dimensions but the first one, which is the
+        batch dimension.
+
+        Args:
+            input_feed (Dict): A dictionary containing the input data for prediction.
+            max_batch_size (int): The maximum number of feeds in a batch. Defaults to 32.
+            max_batch_delay_ms (float): The maximum time to wait for a batch to fill, in milliseconds. Defaults to 2.0.
+                The batching settings are fixed by the first call until `close` is called.
+
+        Returns:
+            A future that resolves to the predictions for this feed. Async callers can await it
+            with `asyncio.wrap_future`.
+
+        Raises:
+            ValueError: If the session is not initialized or the batching settings differ from the
+                running dispatcher.
+        """
+        if self.session is None:
+            raise ValueError("Session is not initialized.")
+        settings = (max_batch_size, max_batch_delay_ms / 1000)
+        if self._batcher is None:
+            # The worker thread must not keep the model alive, so only the session is captured
+            session = self.session
+            self._batcher = _BatchDispatcher(
+                lambda feed: session.run(None, feed)[0], *settings
+            )
+            self._batcher_finalizer = weakref.finalize(self, self._batcher.close)
+        elif settings != self._batcher.settings:
+            raise ValueError(
+                "The batch dispatcher is running with different settings, "
+                "call close() before changing them."
+            )
+        return self._batcher.submit(input_feed)
+
+    def predict_many(
+        self, input_feeds: List[Dict], max_workers: Optional[int] = None
+    ) -> List[np.ndarray]:
         """
-        Formats the inputs for a prediction request for a specific framework.
+        Makes several independent local predictions in parallel on a pool of worker threads.
+
+        The workers share a session running each operator on a single thread, so the pool
+        spreads the predictions over the cores instead of every run competing for all of
+        them. Each worker has its own IOBinding.
 
         Args:
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments.
+            input_feeds (List[Dict]): The input feeds to predict, one dictionary per prediction.
+            max_workers (Optional[int]): The number of worker threads. Defaults to the number of CPUs.
+                The pool is created on the first call and kept until `close` is called.
+
+        Returns:
+            The predictions, in the same order as the input feeds.
+
+        Raises:
+            ValueError: If the session is not initialized or `max_workers` differs from the running pool.
+        """
+        if self.session is None:
+            raise ValueError("Session is not initialized.")
+        if self._pool is None:
+            self._pool_session = self._load_session(
+                self._model_file, intra_op_num_threads=1
+            )
+            self._pool_workers = max_workers or os.cpu_count() or 1
+            self._pool = ThreadPoolExecutor(
+                max_workers=self._pool_workers, thread_name_prefix="giza-predict"
+            )
+        elif max_workers is not None and max_workers != self._pool_workers:
+            raise ValueError(
+                f"The prediction pool is running with {self._pool_workers} workers, "
+                "call close() before changing it."
+            )
+        session, bindings = self._pool_session, self._pool_bindings
+        return list(
+            self._pool.map(
+                lambda feed: self._run_session(
+                    feed, session=session, bindings=bindings
+                ),
+                input_feeds,
+            )
+        )
+
+    def close(self) -> None:
+        """
+        Stops the worker threads started by `predict_batched` and `predict_many`. The model
+        can still be used afterwards, they are started again when needed.
+        """
+        if self._batcher is not None:
+            self._batcher_finalizer()
+            self._batcher = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._pool_workers = None
+            self._pool_session = None
+            self._pool_bindings = _LocalBindings()
+
+    def _run_session(
+        self,
+        input_feed: Dict,
+        out: Optional[np.ndarray] = None,
+        session: Optional[ort.InferenceSession] = None,
+        bindings: Optional[_LocalBindings] = None,
+    ) -> np.ndarray:
+        """
+        Runs the local onnxruntime session through an IOBinding, so the inputs are bound
+        as OrtValues sharing the numpy buffers instead of being copied by `session.run`.
+
+        Feeds with values other than numpy arrays, or with string arrays, are run with
+        `session.run` instead, which converts them to the input types of the model.
+        Each thread has its own IOBinding. The first output is copied out of the memory
+        allocated by onnxruntime, so the returned array belongs to the caller, unless `out`
+        is given, in which case it is written directly into it.
+        When every output has a static shape and the input shapes do not change, the output
+        bindings are kept and only the inputs are rebound.
+
+        Args:
+            input_feed (Dict): A dictionary with the input name as key and the array as value.
+            out (Optional[np.ndarray]): A C contiguous array to write the first output into. Defaults to None.
+            session (Optional[ort.InferenceSession]): The session to run. Defaults to the model session.
+            bindings (Optional[_LocalBindings]): The IOBindings of `session`. Defaults to the ones of the model session.
+
+        Returns:
+            The first output of the model, `out` if given.
+
+        Raises:
+            ValueError: If `out` is not C contiguous.
+        """
+        session = session or self.session
+        if not all(
+            isinstance(value, np.ndarray) and value.dtype.kind not in "OSU"
+            for value in input_feed.values()
+        ):
+            # Let onnxruntime convert lists and scalars to the input types of the model,
+            # string tensors can not be wrapped as OrtValues either
+            result = session.run(None, input_feed)[0]
+            if out is None:
+                return result
+            out[...] = result
+            return out
+
+        state = bindings or self._bindings
+        if state.io_binding is None:
+            state.io_binding = session.io_binding()
+            # Otherwise the output shapes can change between runs with the same inputs
+            state.static_outputs = all(
+                output.type.startswith("tensor")
+                and all(isinstance(dim, int) for dim in output.shape)
+                for output in session.get_outputs()
+            )
+
+        feed = {
+            name: np.require(value, requirements="C")
+            for name, value in input_feed.items()
+        }
+        signature = tuple(
+            (name, value.shape, value.dtype.str) for name, value in feed.items()
+        )
+        for name, value in feed.items():
+            # The OrtValue wraps the numpy buffer, keep it alive until the next run
+            state.input_values[name] = ort.OrtValue.ortvalue_from_numpy(value)
+            state.io_binding.bind_ortvalue_input(name, state.input_values[name])
+
+        # The outputs are returned in binding order, so the first one is bound first
+        outputs = session.get_outputs()
+        if out is not None:
+            if not out.flags.c_contiguous:
+                raise ValueError("The output array must be C contiguous.")
+            state.io_binding.bind_output(
+                outputs[0].name, "cpu", 0, out.dtype, out.shape, out.ctypes.data
+            )
+            for output in outputs[1:]:
+                state.io_binding.bind_output(output.name, "cpu")
+            state.bound_signature = None
+            session.run_with_iobinding(state.io_binding)
+            return out
+
+        # Outputs bound to "cpu" keep the memory allocated by the previous run, so they are
+        # rebound unless their shape is known to be the same
+        if not state.static_outputs or signature != state.bound_signature:
+            for output in outputs:
+                state.io_binding.bind_output(output.name, "cpu")
+            state.bound_signature = signature
+
+        session.run_with_iobinding(state.io_binding)
+        return state.io_binding.copy_outputs_to_cpu()[0]
+
+    def _get_inputs_formatter(self) -> Callable[..., Dict[str, Any]]:
+        """
+        Selects the formatter of prediction requests for the framework of the model, so the
+        dispatch is done once instead of on every prediction.
+
+        Returns:
+            The method formatting the inputs for the framework.
         """
         match self.framework:
             case Framework.CAIRO:
-                return self._format_inputs_for_cairo(*args, **kwargs)
+                return self._format_inputs_for_cairo
             case Framework.EZKL:
-                return self._format_inputs_for_ezkl(*args, **kwargs)
+                return self._format_inputs_for_ezkl
             case _:
                 # This should never happen
                 raise ValueError(f"Unsupported framework: {self.framework}")
@@ -370,24 +1149,28 @@ class GizaModel:
         Returns:
             Dict: A dictionary representing the formatted inputs for the Cairo prediction request.
         """
-        formatted_args = []
+        args = io.StringIO()
+        sep = ""
 
         if input_file:
-            formatted_args.append(serialize(input_file, model_category))
+            args.write(serialize(input_file, model_category))
+            sep = " "
 
         if input_feed:
             for name, value in input_feed.items():
                 if isinstance(value, np.ndarray):
+                    args.write(sep)
+                    sep = " "
                     if model_category == "ONNX_ORION":
-                        tensor = create_tensor_from_array(value, fp_impl)
+                        args.write(_serialize_fixed_point(value, fp_impl))
                     elif model_category in ["XGB", "LGBM"]:
                         tensor = value * 100000
                         tensor = tensor.astype(np.int64)
+                        args.write(_serialize_integers(tensor))
                     else:
-                        tensor = create_tensor_from_array(value, "FP16x16")
-                    formatted_args.append(serializer(tensor))
+                        args.write(_serialize_fixed_point(value, "FP16x16"))
 
-        return {"job_size": job_size, "args": " ".join(formatted_args)}
+        return {"job_size": job_size, "args": args.getvalue()}
 
     def _format_inputs_for_ezkl(
         self,
@@ -408,19 +1191,23 @@ class GizaModel:
             dict: A dictionary representing the formatted inputs for the EZKL prediction request.
         """
         if input_file is not None:
-            data = load_data(input_file).reshape([-1])
+            if Path(input_file).suffix == ".npy":
+                # Map the file instead of reading it, pages are loaded as they are used
+                data = np.load(input_file, mmap_mode="r").reshape([-1])
+            else:
+                data = load_data(input_file).reshape([-1])
         elif input_feed is not None:
-            match input_feed:
-                case dict():
-                    data = input_feed["input_data"]
-                case list():
-                    data = input_feed
-                case np.ndarray():
-                    data = input_feed.reshape([-1])
-                case _:
-                    raise ValueError(
-                        "Invalid input_feed format. Must be a dictionary with 'input_data' containintg the data array."
-                    )
+            # Checked in order of expected frequency
+            if isinstance(input_feed, dict):
+                data = input_feed["input_data"]
+            elif isinstance(input_feed, np.ndarray):
+                data = input_feed.reshape([-1])
+            elif isinstance(input_feed, list):
+                data = input_feed
+            else:
+                raise ValueError(
+                    "Invalid input_feed format. Must be a dictionary with 'input_data' containintg the data array."
+                )
         return {"input_data": [data], "job_size": job_size}
 
     def _parse_cairo_response(
@@ -449,12 +1236,8 @@ class GizaModel:
 
         self._download_model()
 
-        if self._output_path in self._cache:
-            file_path = Path(self._cache.get(self._output_path))
-            with open(file_path, "rb") as f:
-                file = f.read()
-
-        model = onnx.load_model_from_string(file)
+        file_path = Path(self._cache.get(self._output_path))
+        model = onnx.load(file_path, load_external_data=False)
         graph = model.graph
         output_tensor_name = graph.output[0].name
 
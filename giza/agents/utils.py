@@ -1,13 +1,67 @@
 import json
 import logging
-from typing import Optional
+import os
+from functools import lru_cache
+from typing import Optional, Type, TypeVar
 
 import requests
 from giza.cli import API_HOST
-from giza.cli.client import EndpointsClient, WorkspaceClient
+from giza.cli.client import ApiClient, EndpointsClient, WorkspaceClient
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+ClientT = TypeVar("ClientT", bound=ApiClient)
+
+
+@lru_cache(maxsize=None)
+def get_session() -> requests.Session:
+    """
+    Retrieves the HTTP session shared by the Giza API clients and the deployment requests.
+
+    Every giza-cli client opens its own session, sharing one keeps the connections to
+    the API and the deployments alive between clients, polls and predictions, avoiding
+    a new TLS handshake each time.
+
+    Returns:
+        requests.Session: The shared session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _clear_session_pools() -> None:
+    """
+    Drops the connections inherited from the parent process after a fork, the child
+    would otherwise share their sockets with the parent.
+    """
+    if get_session.cache_info().currsize == 0:
+        return
+    for adapter in get_session().adapters.values():
+        adapter.poolmanager.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_session_pools)
+
+
+def create_client(client_cls: Type[ClientT]) -> ClientT:
+    """
+    Creates a Giza API client for the API_HOST that uses the shared HTTP session.
+
+    Args:
+        client_cls (Type[ApiClient]): The class of the client to create.
+
+    Returns:
+        ApiClient: The client instance.
+    """
+    client = client_cls(API_HOST)
+    client.session = get_session()
+    return client
+
 
 def get_workspace_uri() -> str:
     """
@@ -20,7 +74,7 @@ def get_workspace_uri() -> str:
     Returns:
         str: The URL of the current workspace.
     """
-    client = WorkspaceClient(API_HOST)
+    client = create_client(WorkspaceClient)
     try:
         workspace = client.get()
     except requests.exceptions.RequestException:
@@ -47,7 +101,7 @@ def get_endpoint_uri(model_id: int, version_id: int) -> Optional[str]:
     Returns:
         str: The URI of the deployment.
     """
-    client = EndpointsClient(API_HOST)
+    client = create_client(EndpointsClient)
     deployments_list = client.list(
         params={"model_id": model_id, "version_id": version_id, "is_active": True}
     )
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import Mock, patch
 
 import pytest
@@ -7,6 +8,7 @@ from giza.cli.schemas.proofs import Proof
 from giza.cli.schemas.verify import VerifyResponse
 
 from giza.agents import AgentResult, ContractHandler, GizaAgent
+from giza.agents.utils import read_json
 
 
 class EndpointsClientStub:
@@ -126,6 +128,35 @@ def test_agent_init_with_check_succesful_check(mock_check, mock_info, mock_init_
     mock_check.assert_called_once()
 
 
+@patch("giza.agents.agent.GizaAgent._check_or_create_account")
+@patch("giza.agents.agent.GizaAgent._retrieve_agent_info")
+@patch("giza.agents.model.GizaModel.__init__")
+@patch.dict("os.environ", {"TEST_PASSPHRASE": "test"})
+def test_agent_init_defers_provider(mock_check, mock_info, mock_init_):
+    network_parser = Mock(side_effect=NetworkError)
+    agent = GizaAgent(
+        id=1,
+        version_id=1,
+        contracts={"contract": "0x17807a00bE76716B91d5ba1232dd1647c4414912"},
+        chain="ethereum:sepolia:geth",
+        account="test",
+        network_parser=network_parser,
+    )
+
+    network_parser.assert_not_called()
+    with pytest.raises(ValueError):
+        agent._provider
+    network_parser.assert_called_once_with("ethereum:sepolia:geth")
+
+
+@patch.dict("os.environ", {"TEST_PASSPHRASE": "test", "OTHER_PASSPHRASE": "test"})
+def test_agent_validate_accounts():
+    GizaAgent.validate_accounts(["test", "other"])
+
+    with pytest.raises(ValueError, match="missing, absent"):
+        GizaAgent.validate_accounts(["test", "missing", "absent"])
+
+
 # TODO: find a better way, this should be kind of an integration test with ape, using a KeyfileAccount
 @patch("giza.agents.agent.GizaAgent._update_agent")
 @patch("giza.agents.agent.GizaAgent._check_or_create_account")
@@ -210,6 +241,19 @@ def test_agentresult_init():
     assert result._AgentResult__value == [1]
 
 
+def test_agentresult_init_default_clients():
+    first = AgentResult(
+        input=[], result=[1], request_id="123", agent=Mock(), dry_run=True
+    )
+    second = AgentResult(
+        input=[], result=[1], request_id="123", agent=Mock(), dry_run=True
+    )
+
+    assert first._endpoint_client is not second._endpoint_client
+    assert first._jobs_client is not second._jobs_client
+    assert first._proofs_client is not second._proofs_client
+
+
 @patch("giza.agents.agent.AgentResult._verify", return_value=True)
 def test_agentresult_value_already_verified(verify_mock):
     result = AgentResult(
@@ -241,6 +285,28 @@ def test_agentresult__get_proof_job():
     assert job.request_id == "123"
 
 
+def test_agentresult__get_proof_job_cached():
+    agent = Mock()
+    client = EndpointsClientStub()
+    client.list_jobs = Mock(wraps=client.list_jobs)
+
+    first = AgentResult(
+        input=[], result=[1], request_id="123", agent=agent, endpoint_client=client
+    )
+    second = AgentResult(
+        input=[], result=[1], request_id="123", agent=agent, endpoint_client=client
+    )
+
+    assert first._proof_job == second._proof_job
+    client.list_jobs.assert_called_once()
+
+    with pytest.raises(ValueError):
+        AgentResult(
+            input=[], result=[1], request_id="456", agent=agent, endpoint_client=client
+        )
+    assert client.list_jobs.call_count == 2
+
+
 @patch("giza.agents.agent.AgentResult._wait_for_proof")
 @patch("giza.agents.agent.AgentResult._verify_proof", return_value=True)
 def test_agentresult__verify(mock_verify, mock_wait_for_proof):
@@ -276,6 +342,23 @@ def test_agentresult__wait_for_proof(mock_wait_for):
     mock_wait_for.assert_called_once()
 
 
+@patch("giza.agents.agent.AgentResult._wait_for")
+def test_agentresult__wait_for_proof_cached(mock_wait_for):
+    agent = Mock()
+    client = EndpointsClientStub()
+    client.get_proof = Mock(wraps=client.get_proof)
+
+    for _ in range(2):
+        result = AgentResult(
+            input=[], result=[1], request_id="123", agent=agent, endpoint_client=client
+        )
+        result._wait_for_proof(JobsClientStub())
+        assert result._proof.id == 1
+
+    mock_wait_for.assert_called_once()
+    client.get_proof.assert_called_once()
+
+
 def test_agentresult__verify_proof():
     result = AgentResult(
         input=[],
@@ -339,8 +422,9 @@ def test_agentresult__wait_for_timeout():
         )
 
 
+@patch("giza.agents.agent.random.uniform", return_value=1.0)
 @patch("giza.agents.agent.time.sleep")
-def test_agentresult__wait_for_poll_job(mock_sleep):
+def test_agentresult__wait_for_poll_job(mock_sleep, mock_uniform):
     result = AgentResult(
         input=[],
         result=[1],
@@ -349,16 +433,64 @@ def test_agentresult__wait_for_poll_job(mock_sleep):
         endpoint_client=EndpointsClientStub(),
     )
 
+    client = JobsClientStub()
+    client.get = Mock(
+        side_effect=[
+            Job(id=1, size="S", status="PROCESSING"),
+            Job(id=1, size="S", status="COMPLETED"),
+        ]
+    )
+
     wait_return = result._wait_for(
         job=Job(id=1, size="S", status="PROCESSING"),
-        client=JobsClientStub(),
+        client=client,
         poll_interval=0.1,
     )
 
     assert wait_return is None
+    assert client.get.call_count == 2
     mock_sleep.assert_called_once_with(0.1)
 
 
+@patch("giza.agents.agent.time.sleep")
+def test_agentresult__wait_for_refresh_before_sleep(mock_sleep):
+    result = AgentResult(
+        input=[],
+        result=[1],
+        request_id="123",
+        agent=Mock(),
+        endpoint_client=EndpointsClientStub(),
+    )
+
+    wait_return = result._wait_for(
+        job=Job(id=1, size="S", status="PROCESSING"),
+        client=JobsClientStub(),
+        poll_interval=0.1,
+    )
+
+    assert wait_return is None
+    mock_sleep.assert_not_called()
+
+
+def test_agentresult__backoff_delay():
+    result = AgentResult(
+        input=[],
+        result=[1],
+        request_id="123",
+        agent=Mock(),
+        endpoint_client=EndpointsClientStub(),
+    )
+
+    with patch("giza.agents.agent.random.uniform", return_value=1.0):
+        assert result._backoff_delay(0, 10) == 0.5
+        assert result._backoff_delay(2, 10) == 2.0
+        assert result._backoff_delay(10, 10) == 10.0
+
+    for attempt in range(10):
+        delay = result._backoff_delay(attempt, 10)
+        assert 0.25 <= delay <= 10.0
+
+
 def test_contract_handler_init():
     handler = ContractHandler(
         contracts={"contract": "0x17807a00bE76716B91d5ba1232dd1647c4414912"}
@@ -394,6 +526,31 @@ def test_contract_handler__initiate_contract(mock_contract):
     )
 
 
+@patch("giza.agents.agent.Contract")
+def test_contract_handler__initiate_contract_abi_file(mock_contract, tmp_path):
+    abi = [{"type": "function", "name": "name", "inputs": [], "outputs": []}]
+    abi_path = tmp_path / "abi.json"
+    abi_path.write_text(json.dumps(abi))
+    handler = ContractHandler(
+        contracts={
+            "contract": ["0x17807a00bE76716B91d5ba1232dd1647c4414912", str(abi_path)]
+        }
+    )
+
+    with patch("giza.agents.agent.read_json", wraps=read_json) as mock_read:
+        handler._initiate_contract(
+            "0x17807a00bE76716B91d5ba1232dd1647c4414912", str(abi_path)
+        )
+        handler._initiate_contract(
+            "0x17807a00bE76716B91d5ba1232dd1647c4414912", str(abi_path)
+        )
+
+    mock_read.assert_called_once()
+    mock_contract.assert_called_with(
+        address="0x17807a00bE76716B91d5ba1232dd1647c4414912", abi=abi
+    )
+
+
 @patch("giza.agents.agent.Contract")
 def test_contract_handler_handle(mock_contract):
     handler = ContractHandler(
@@ -414,6 +571,22 @@ def test_contract_handler_handle(mock_contract):
     )
 
 
+@patch("giza.agents.agent.Contract")
+def test_contract_handler_handle_reuses_instances(mock_contract):
+    handler = ContractHandler(
+        contracts={
+            "contract": "0x17807a00bE76716B91d5ba1232dd1647c4414912",
+            "contract2": "0x17807a00bE76716B91d5ba1232dd1647c4414912",
+        }
+    )
+
+    first = handler.handle().contract
+    second = handler.handle().contract
+
+    assert first is second
+    assert mock_contract.call_count == 2
+
+
 @patch("giza.agents.agent.ContractHandler._initiate_contract", side_effect=NetworkError)
 def test_contract_handler_network_error(mock_contract):
     handler = ContractHandler(
@@ -1,13 +1,31 @@
 # TODO: Implement a test env.
+import gc
+import glob
 import os
 import tempfile
-from unittest.mock import patch
+import threading
+import time
+from unittest.mock import MagicMock, patch
 
 import numpy as np
+import onnx
+import orjson
+import pytest
+import requests
+from giza.cli.client import ApiClient
 from giza.cli.schemas.models import Model
 from giza.cli.schemas.versions import Version
+from osiris.cairo.serde.data_structures import create_tensor_from_array
+from osiris.cairo.serde.serialize import serializer
 
-from giza.agents.model import GizaModel
+from giza.agents.model import (
+    GizaModel,
+    _api_clients,
+    _dumps_payload,
+    _fixed_point_buffers,
+    _serialize_fixed_point,
+    _serialize_integers,
+)
 
 
 class ResponseStub:
@@ -17,6 +35,10 @@ class ResponseStub:
     def json(self):
         return self._json
 
+    @property
+    def content(self):
+        return orjson.dumps(self._json)
+
     def raise_for_status(self):
         pass
 
@@ -38,7 +60,7 @@ class ResponseStub:
 @patch("giza.agents.model.GizaModel._retrieve_uri")
 @patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
 @patch(
-    "giza.agents.model.requests.post",
+    "giza.agents.model.requests.Session.post",
     return_value=ResponseStub(
         {"request_id": "123", "result": {"arr_1": [[1, 2], [3, 4]]}}
     ),
@@ -78,7 +100,7 @@ def test_predict_success(*args):
 @patch("giza.agents.model.GizaModel._retrieve_uri")
 @patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
 @patch(
-    "giza.agents.model.requests.post",
+    "giza.agents.model.requests.Session.post",
     return_value=ResponseStub(
         {"request_id": "123", "result": {"arr_1": [[1, 2], [3, 4]]}}
     ),
@@ -140,3 +162,854 @@ def test_cache_implementation(*args):
     cache_size_after_fourth_call = len(model._cache)
     assert result3 == result4
     assert cache_size_after_third_call == cache_size_after_fourth_call
+
+
+def _write_add_model(path, batch_size=None):
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [batch_size, 2])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [batch_size, 2])
+    out = onnx.helper.make_tensor_value_info(
+        "out", onnx.TensorProto.FLOAT, [batch_size, 2]
+    )
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("Add", ["x", "y"], ["out"])], "add", [x, y], [out]
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def test_predict_local_session():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+
+        model = GizaModel(model_path=model_path)
+        other = GizaModel(model_path=model_path)
+        assert model.session is other.session
+
+        x = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        for _ in range(2):
+            result, req_id = model.predict(input_feed={"x": x, "y": x})
+            assert np.array_equal(result, x + x)
+            assert req_id is None
+
+
+def _write_add_concat_model(path):
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None, 2])
+    y = onnx.helper.make_tensor_value_info("y", onnx.TensorProto.FLOAT, [None, 2])
+    total = onnx.helper.make_tensor_value_info("sum", onnx.TensorProto.FLOAT, [None, 2])
+    cat = onnx.helper.make_tensor_value_info("cat", onnx.TensorProto.FLOAT, [None, 4])
+    graph = onnx.helper.make_graph(
+        [
+            onnx.helper.make_node("Add", ["x", "y"], ["sum"]),
+            onnx.helper.make_node("Concat", ["x", "y"], ["cat"], axis=1),
+        ],
+        "add_concat",
+        [x, y],
+        [total, cat],
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def test_predict_local_session_list_inputs():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        result, _ = model.predict(input_feed={"x": [[1.0, 2.0]], "y": [[3.0, 4.0]]})
+        assert result.dtype == np.float32
+        assert np.array_equal(result, [[4.0, 6.0]])
+
+
+def test_predict_local_session_scalar_inputs():
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [])
+    out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.FLOAT, [])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("Neg", ["x"], ["out"])], "neg", [x], [out]
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "neg.onnx")
+        onnx.save(model, model_path)
+        model = GizaModel(model_path=model_path)
+
+        result, _ = model.predict(input_feed={"x": np.array(2.0, dtype=np.float32)})
+        assert result.shape == ()
+        assert result == -2.0
+
+
+def test_predict_local_session_string_inputs():
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.STRING, [None])
+    out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.STRING, [None])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("Identity", ["x"], ["out"])], "identity", [x], [out]
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "identity.onnx")
+        onnx.save(model, model_path)
+        model = GizaModel(model_path=model_path)
+
+        for inputs in (np.array(["a", "bc"]), np.array(["a", "bc"], dtype=object)):
+            result, _ = model.predict(input_feed={"x": inputs})
+            assert list(result) == ["a", "bc"]
+
+
+def test_predict_local_session_returns_first_output():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add_concat.onnx")
+        _write_add_concat_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        x = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        for i in range(3):
+            result, _ = model.predict(input_feed={"x": x, "y": i * x})
+            assert np.array_equal(result, (i + 1) * x)
+
+
+def test_predict_local_session_returns_new_arrays():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        x = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        first, _ = model.predict(input_feed={"x": x, "y": x})
+        second, _ = model.predict(input_feed={"x": x, "y": 2 * x})
+
+        assert second is not first
+        assert np.array_equal(first, 2 * x)
+        assert np.array_equal(second, 3 * x)
+
+
+def test_predict_local_session_writes_into_out():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        x = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        out = np.empty_like(x)
+        result, _ = model.predict(input_feed={"x": x, "y": x}, out=out)
+        assert result is out
+        assert np.array_equal(out, 2 * x)
+
+        other, _ = model.predict(input_feed={"x": x, "y": 2 * x})
+        assert other is not out
+        assert np.array_equal(out, 2 * x)
+        assert np.array_equal(other, 3 * x)
+
+        with pytest.raises(ValueError):
+            model.predict(input_feed={"x": x, "y": x}, out=np.empty((2, 4))[:, :2])
+
+
+def test_predict_local_session_keeps_bindings_for_fixed_shapes():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path, batch_size=2)
+        model = GizaModel(model_path=model_path)
+
+        x = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        model.predict(input_feed={"x": x, "y": x})
+        binding = model._bindings.io_binding
+        with patch.object(
+            type(binding), "bind_output", wraps=binding.bind_output
+        ) as mock_bind:
+            for i in range(3):
+                result, _ = model.predict(input_feed={"x": x, "y": i * x})
+                assert np.array_equal(result, (i + 1) * x)
+        mock_bind.assert_not_called()
+
+
+def test_predict_local_session_changing_batch_size():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        for batch_size in (2, 3, 2):
+            x = np.ones((batch_size, 2), dtype=np.float32)
+            result, _ = model.predict(input_feed={"x": x, "y": x})
+            assert np.array_equal(result, 2 * x)
+
+
+def test_predict_local_session_value_dependent_output_shape():
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [4])
+    out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.INT64, [1, None])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("NonZero", ["x"], ["out"])], "nonzero", [x], [out]
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "nonzero.onnx")
+        onnx.save(model, model_path)
+        model = GizaModel(model_path=model_path)
+
+        for values in ([1, 0, 0, 0], [1, 1, 0, 1], [0, 0, 0, 0]):
+            inputs = np.array(values, dtype=np.float32)
+            result, _ = model.predict(input_feed={"x": inputs})
+            assert np.array_equal(result, np.array(np.nonzero(inputs)))
+
+
+def test_predict_local_session_classifier_with_zipmap():
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None, 2])
+    label = onnx.helper.make_tensor_value_info("label", onnx.TensorProto.INT64, [None])
+    probabilities = onnx.helper.make_value_info(
+        "probabilities",
+        onnx.helper.make_sequence_type_proto(
+            onnx.helper.make_map_type_proto(
+                onnx.TensorProto.INT64,
+                onnx.helper.make_tensor_type_proto(onnx.TensorProto.FLOAT, []),
+            )
+        ),
+    )
+    graph = onnx.helper.make_graph(
+        [
+            onnx.helper.make_node(
+                "LinearClassifier",
+                ["x"],
+                ["label", "scores"],
+                domain="ai.onnx.ml",
+                classlabels_ints=[0, 1],
+                coefficients=[1.0, 0.0, 0.0, 1.0],
+                intercepts=[0.0, 0.0],
+            ),
+            onnx.helper.make_node(
+                "ZipMap",
+                ["scores"],
+                ["probabilities"],
+                domain="ai.onnx.ml",
+                classlabels_int64s=[0, 1],
+            ),
+        ],
+        "classifier",
+        [x],
+        [label, probabilities],
+    )
+    model = onnx.helper.make_model(
+        graph,
+        opset_imports=[
+            onnx.helper.make_opsetid("", 13),
+            onnx.helper.make_opsetid("ai.onnx.ml", 1),
+        ],
+    )
+    model.ir_version = 8
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "classifier.onnx")
+        onnx.save(model, model_path)
+        model = GizaModel(model_path=model_path)
+
+        inputs = np.array([[1, 0], [0, 1], [2, 3]], dtype=np.float32)
+        for _ in range(2):
+            result, _ = model.predict(input_feed={"x": inputs})
+            assert np.array_equal(result, [0, 1, 1])
+
+
+def test_predict_local_session_binds_inputs_without_copy():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        x = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        result, _ = model.predict(input_feed={"x": x, "y": x})
+
+        bound = model._bindings.input_values["x"]
+        assert bound.data_ptr() == x.ctypes.data
+        assert np.array_equal(result, x + x)
+
+
+def test_predict_many():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        x = np.ones((2, 2), dtype=np.float32)
+        feeds = [{"x": x, "y": i * x} for i in range(8)]
+        results = model.predict_many(feeds, max_workers=3)
+
+        assert len(results) == len(feeds)
+        for i, result in enumerate(results):
+            assert np.array_equal(result, (i + 1) * x)
+
+        options = model._pool_session.get_session_options()
+        assert model._pool_session is not model.session
+        assert options.intra_op_num_threads == 1
+
+        assert len(model.predict_many(feeds[:2])) == 2
+        with pytest.raises(ValueError):
+            model.predict_many(feeds, max_workers=2)
+
+        model.close()
+        assert model._pool is None
+        assert len(model.predict_many(feeds, max_workers=2)) == len(feeds)
+        model.close()
+
+
+def _write_unary_model(path, op_type):
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None])
+    out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.FLOAT, [None])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node(op_type, ["x"], ["out"])], "unary", [x], [out]
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+    onnx.save(model, path)
+
+
+def test_local_session_reloads_overwritten_model():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "unary.onnx")
+        inputs = np.array([-1.0, 2.0], dtype=np.float32)
+
+        _write_unary_model(model_path, "Neg")
+        result, _ = GizaModel(model_path=model_path).predict(input_feed={"x": inputs})
+        assert np.array_equal(result, -inputs)
+
+        _write_unary_model(model_path, "Abs")
+        # Make sure the new file is seen as a new version even on coarse timestamps
+        stat = os.stat(model_path)
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        result, _ = GizaModel(model_path=model_path).predict(input_feed={"x": inputs})
+        assert np.array_equal(result, np.abs(inputs))
+
+
+def test_predict_batched():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        feeds = [
+            {
+                "x": np.full((1, 2), i, dtype=np.float32),
+                "y": np.ones((1, 2), dtype=np.float32),
+            }
+            for i in range(4)
+        ]
+        with patch.object(model.session, "run", wraps=model.session.run) as mock_run:
+            futures = [
+                model.predict_batched(feed, max_batch_delay_ms=100) for feed in feeds
+            ]
+            results = [future.result(timeout=5) for future in futures]
+
+        for i, result in enumerate(results):
+            assert np.array_equal(result, np.full((1, 2), i + 1, dtype=np.float32))
+        assert mock_run.call_count < len(feeds)
+
+
+def test_predict_batched_settings_and_close():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel(model_path=model_path)
+
+        x = np.ones((1, 2), dtype=np.float32)
+        result = model.predict_batched({"x": x, "y": x}).result(timeout=5)
+        assert np.array_equal(result, 2 * x)
+        with pytest.raises(ValueError):
+            model.predict_batched({"x": x, "y": x}, max_batch_size=4)
+
+        worker = model._batcher._worker
+        model.close()
+        assert not worker.is_alive()
+
+        result = model.predict_batched({"x": x, "y": x}, max_batch_size=4)
+        assert np.array_equal(result.result(timeout=5), 2 * x)
+        worker = model._batcher._worker
+        del model, result
+        gc.collect()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+
+
+@patch("giza.agents.model.GizaModel._get_credentials")
+@patch("giza.agents.model.GizaModel._get_model", return_value=Model(id=50))
+@patch(
+    "giza.agents.model.GizaModel._get_version",
+    return_value=Version(
+        version=2,
+        framework="CAIRO",
+        size=1,
+        status="COMPLETED",
+        created_date="2022-01-01T00:00:00Z",
+        last_update="2022-01-01T00:00:00Z",
+    ),
+)
+@patch("giza.agents.model.GizaModel._retrieve_uri")
+@patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
+def test_init_downloaded_model_session(*args):
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        with open(model_path, "rb") as f:
+            onnx_model = f.read()
+
+        with patch(
+            "giza.agents.model.VersionsClient.download_original",
+            return_value=onnx_model,
+        ) as mock_download:
+            model = GizaModel(
+                id=50, version=2, output_path=os.path.join(tempdir, "model.onnx")
+            )
+
+        mock_download.assert_called_once()
+        assert model.session is not None
+
+        x = np.array([[1, 2]], dtype=np.float32)
+        result, _ = model.predict(input_feed={"x": x, "y": x})
+        assert np.array_equal(result, x + x)
+
+
+@patch("giza.agents.model.GizaModel._get_model", return_value=Model(id=50))
+@patch(
+    "giza.agents.model.GizaModel._get_version",
+    return_value=Version(
+        version=2,
+        framework="CAIRO",
+        size=1,
+        status="COMPLETED",
+        created_date="2022-01-01T00:00:00Z",
+        last_update="2022-01-01T00:00:00Z",
+    ),
+)
+@patch("giza.agents.model.GizaModel._set_session")
+@patch("giza.agents.model.GizaModel._retrieve_uri")
+@patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
+def test_init_shares_api_clients(*args):
+    api_client = _api_clients()[2]
+    with patch.object(api_client, "token", None), patch.object(
+        api_client, "api_key", None
+    ), patch.object(api_client, "retrieve_token") as mock_token, patch.object(
+        api_client,
+        "retrieve_api_key",
+        side_effect=lambda: setattr(api_client, "api_key", "key"),
+    ) as mock_api_key:
+        first = GizaModel(id=50, version=2)
+        second = GizaModel(id=50, version=2)
+
+    assert first.version_client is second.version_client
+    assert first.api_client is second.api_client is api_client
+    mock_token.assert_called_once()
+    mock_api_key.assert_called_once()
+
+
+@patch("giza.agents.model.GizaModel._get_model", return_value=Model(id=50))
+@patch(
+    "giza.agents.model.GizaModel._get_version",
+    return_value=Version(
+        version=2,
+        framework="CAIRO",
+        size=1,
+        status="COMPLETED",
+        created_date="2022-01-01T00:00:00Z",
+        last_update="2022-01-01T00:00:00Z",
+    ),
+)
+@patch("giza.agents.model.GizaModel._set_session")
+@patch("giza.agents.model.GizaModel._retrieve_uri")
+@patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
+@pytest.mark.parametrize("reason", ["expired", "missing", "ttl"])
+def test_init_rebuilds_stale_api_clients(
+    mock_endpoint_id, mock_uri, mock_session, mock_version, mock_model, reason
+):
+    _api_clients.cache_clear()
+    api_client = _api_clients()[2]
+    with patch.object(
+        ApiClient, "retrieve_token", autospec=True
+    ) as mock_token, patch.object(ApiClient, "retrieve_api_key"), patch.object(
+        ApiClient, "_is_expired", return_value=True
+    ):
+        if reason == "expired":
+            api_client.token = "token"
+        elif reason == "missing":
+            GizaModel(id=50, version=2)
+        with patch(
+            "giza.agents.model._api_clients_deadline",
+            0.0 if reason == "ttl" else time.monotonic() + 60,
+        ):
+            model = GizaModel(id=50, version=2)
+
+    assert model.api_client is not api_client
+    assert mock_token.call_args.args[0] is model.api_client
+    _api_clients.cache_clear()
+
+
+@pytest.mark.parametrize("fp_impl", ["FP16x16", "FP8x23", "FP32x32", "FP64x64"])
+@pytest.mark.parametrize(
+    "value",
+    [
+        np.array([[1.5, -2.25], [0.0, -0.0]], dtype=np.float32),
+        np.linspace(-10, 10, 7),
+        np.array(3.0),
+        np.zeros((0, 2)),
+        np.array([[1, -2], [3, 4]], dtype=np.int32),
+        np.array([1e30]),
+    ],
+)
+def test_serialize_fixed_point_matches_osiris(value, fp_impl):
+    expected = serializer(create_tensor_from_array(value, fp_impl))
+    assert _serialize_fixed_point(value, fp_impl) == expected
+
+
+def test_serialize_fixed_point_reuses_buffers():
+    first = np.array([0.5, -1.25, 3.0])
+    second = np.array([2.0, -0.75, 1.5])
+
+    assert _serialize_fixed_point(first, "FP16x16") == serializer(
+        create_tensor_from_array(first, "FP16x16")
+    )
+    buffers = _fixed_point_buffers(first.size)
+    assert _serialize_fixed_point(second, "FP16x16") == serializer(
+        create_tensor_from_array(second, "FP16x16")
+    )
+    assert _fixed_point_buffers(second.size) is buffers
+
+
+def test_serialize_integers_matches_osiris():
+    value = (np.linspace(-1, 1, 12).reshape(2, 2, 3) * 100000).astype(np.int64)
+    assert _serialize_integers(value) == serializer(value)
+
+
+@patch("giza.agents.model.GizaModel._get_credentials")
+@patch("giza.agents.model.GizaModel._get_model", return_value=Model(id=50))
+@patch(
+    "giza.agents.model.GizaModel._get_version",
+    return_value=Version(
+        version=2,
+        framework="EZKL",
+        size=1,
+        status="COMPLETED",
+        created_date="2022-01-01T00:00:00Z",
+        last_update="2022-01-01T00:00:00Z",
+    ),
+)
+@patch("giza.agents.model.GizaModel._set_session")
+@patch("giza.agents.model.GizaModel._retrieve_uri")
+@patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
+def test_init_selects_inputs_formatter(*args):
+    model = GizaModel(id=50, version=2)
+    assert model._format_inputs == model._format_inputs_for_ezkl
+
+
+def test_init_sends_metadata_requests_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def get_model(self, model_id):
+        barrier.wait()
+        return Model(id=model_id)
+
+    def get_version(self, version_id):
+        barrier.wait()
+        return Version(
+            version=version_id,
+            framework="CAIRO",
+            size=1,
+            status="COMPLETED",
+            created_date="2022-01-01T00:00:00Z",
+            last_update="2022-01-01T00:00:00Z",
+        )
+
+    with patch("giza.agents.model.GizaModel._get_credentials"), patch(
+        "giza.agents.model.GizaModel._get_model", get_model
+    ), patch("giza.agents.model.GizaModel._get_version", get_version), patch(
+        "giza.agents.model.GizaModel._set_session", return_value=None
+    ), patch(
+        "giza.agents.model.GizaModel._retrieve_uri", return_value="uri"
+    ), patch(
+        "giza.agents.model.GizaModel._get_endpoint_id", return_value=1
+    ):
+        model = GizaModel(id=50, version=2)
+
+    assert model.model.id == 50
+    assert model.version.version == 2
+    assert model.uri == "uri"
+    assert model.endpoint_id == 1
+
+
+def test_init_gets_version_while_model_is_requested():
+    def get_model(model_id):
+        time.sleep(0.2)
+        return Model(id=model_id)
+
+    model_client = MagicMock()
+    model_client.get.side_effect = get_model
+    version_client = MagicMock()
+    version_client.get.return_value = Version(
+        version=2,
+        framework="CAIRO",
+        size=1,
+        status="COMPLETED",
+        created_date="2022-01-01T00:00:00Z",
+        last_update="2022-01-01T00:00:00Z",
+    )
+    clients = (model_client, version_client, MagicMock(), MagicMock())
+
+    with patch("giza.agents.model._api_clients", return_value=clients), patch(
+        "giza.agents.model.GizaModel._get_credentials"
+    ), patch("giza.agents.model.GizaModel._set_session", return_value=None), patch(
+        "giza.agents.model.GizaModel._retrieve_uri", return_value="uri"
+    ), patch(
+        "giza.agents.model.GizaModel._get_endpoint_id", return_value=1
+    ):
+        model = GizaModel(id=50, version=2)
+
+    version_client.get.assert_called_once_with(50, 2)
+    assert model.model.id == 50
+    assert model.version.version == 2
+
+
+@patch("giza.agents.model.GizaModel._get_credentials")
+@patch("giza.agents.model.GizaModel._get_model", return_value=Model(id=50))
+@patch(
+    "giza.agents.model.GizaModel._get_version",
+    return_value=Version(
+        version=2,
+        framework="CAIRO",
+        size=1,
+        status="COMPLETED",
+        created_date="2022-01-01T00:00:00Z",
+        last_update="2022-01-01T00:00:00Z",
+    ),
+)
+@patch("giza.agents.model.GizaModel._retrieve_uri")
+@patch("giza.agents.model.GizaModel._get_endpoint_id", return_value=1)
+@patch(
+    "giza.agents.model.VersionsClient.download_original",
+    side_effect=requests.exceptions.HTTPError("404"),
+)
+def test_init_raises_on_failed_download(*args):
+    with tempfile.TemporaryDirectory() as tempdir:
+        with pytest.raises(requests.exceptions.HTTPError):
+            GizaModel(id=50, version=2, output_path=os.path.join(tempdir, "model.onnx"))
+
+
+@patch("giza.agents.model.GizaModel.__init__", return_value=None)
+def test_format_inputs_for_cairo_separates_tensors(*args):
+    model = GizaModel()
+    x = np.array([[1.5, -2.0]], dtype=np.float32)
+    y = np.array([3, -4], dtype=np.int64)
+
+    result = model._format_inputs_for_cairo(
+        None, {"x": x, "y": y}, "FP16x16", "ONNX_ORION", "S"
+    )
+
+    expected = " ".join(
+        serializer(create_tensor_from_array(value, "FP16x16")) for value in (x, y)
+    )
+    assert result == {"job_size": "S", "args": expected}
+
+
+@patch("giza.agents.model.GizaModel.__init__", return_value=None)
+def test_format_inputs_for_ezkl_maps_npy_file(*args):
+    model = GizaModel()
+    expected = np.arange(6, dtype=np.float32).reshape(2, 3)
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        input_file = os.path.join(tempdir, "input.npy")
+        np.save(input_file, expected)
+        result = model._format_inputs_for_ezkl(input_file, None, "S")
+        data = result["input_data"][0]
+
+        assert isinstance(data.base, np.memmap)
+        assert np.array_equal(data, expected.reshape(-1))
+        assert result["job_size"] == "S"
+        del data, result
+
+
+@patch("giza.agents.model.GizaModel.__init__", return_value=None)
+def test_format_inputs_for_ezkl_input_feed_types(*args):
+    model = GizaModel()
+    values = [1.0, 2.0, 3.0, 4.0]
+
+    for input_feed in (
+        {"input_data": values},
+        values,
+        np.array(values).reshape(2, 2),
+    ):
+        result = model._format_inputs_for_ezkl(None, input_feed, "S")
+        assert list(result["input_data"][0]) == values
+
+    with pytest.raises(ValueError):
+        model._format_inputs_for_ezkl(None, "invalid", "S")
+
+
+def test_dumps_payload_serializes_numpy():
+    with tempfile.TemporaryDirectory() as tempdir:
+        input_file = os.path.join(tempdir, "input.npy")
+        np.save(input_file, np.arange(4, dtype=np.float32))
+        mapped = np.load(input_file, mmap_mode="r")
+        payload = {
+            "input_data": [
+                mapped,
+                np.arange(5)[::2],
+                np.array([0.5], dtype=np.float16),
+                np.float32(1.5),
+            ],
+            "job_size": "S",
+        }
+        result = orjson.loads(_dumps_payload(payload))
+        del mapped, payload
+
+    assert result == {
+        "input_data": [[0.0, 1.0, 2.0, 3.0], [0, 2, 4], [0.5], 1.5],
+        "job_size": "S",
+    }
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (np.array(1.5), 1.5),
+        (np.array(7, dtype=">i4"), 7),
+        (np.array([1, 2], dtype=">i4"), [1, 2]),
+        (np.array([[0.5, -1.0]], dtype=">f8"), [[0.5, -1.0]]),
+        (np.array([1.0, 2.0, 3.0], dtype=">f4")[::2], [1.0, 3.0]),
+    ],
+)
+def test_dumps_payload_converts_numpy_values(value, expected):
+    payload = {"input_data": value, "args": [value]}
+    assert orjson.loads(_dumps_payload(payload)) == {
+        "input_data": expected,
+        "args": [expected],
+    }
+
+
+def test_predict_local_shared_session():
+    weights = np.arange(2048, dtype=np.float32).reshape(64, 32)
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None, 64])
+    out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.FLOAT, [None, 32])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("MatMul", ["x", "w"], ["out"])],
+        "matmul",
+        [x],
+        [out],
+        [onnx.numpy_helper.from_array(weights, "w")],
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "matmul.onnx")
+        onnx.save(model, model_path)
+
+        shared = GizaModel.from_shared(model_path)
+        assert shared.session is not GizaModel(model_path=model_path).session
+        assert len(glob.glob(os.path.join(tempdir, "matmul.shared.*.data"))) == 1
+
+        inputs = np.ones((2, 64), dtype=np.float32)
+        result, _ = shared.predict(input_feed={"x": inputs})
+        assert np.array_equal(result, inputs @ weights)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_from_shared_creates_new_session_after_fork():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "add.onnx")
+        _write_add_model(model_path)
+        model = GizaModel.from_shared(model_path)
+
+        pid = os.fork()
+        if pid == 0:
+            try:
+                child = GizaModel.from_shared(model_path)
+                x = np.ones((1, 2), dtype=np.float32)
+                result, _ = child.predict(input_feed={"x": x, "y": x})
+                ok = child.session is not model.session and np.array_equal(
+                    result, 2 * x
+                )
+                os._exit(0 if ok else 1)
+            except BaseException:
+                os._exit(2)
+
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert GizaModel.from_shared(model_path).session is model.session
+
+
+def test_from_shared_rebuilds_copy_of_modified_model():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "unary.onnx")
+        inputs = np.array([-1.0, 2.0], dtype=np.float32)
+
+        _write_unary_model(model_path, "Neg")
+        result, _ = GizaModel.from_shared(model_path).predict(input_feed={"x": inputs})
+        assert np.array_equal(result, -inputs)
+
+        _write_unary_model(model_path, "Abs")
+        stat = os.stat(model_path)
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        result, _ = GizaModel.from_shared(model_path).predict(input_feed={"x": inputs})
+        assert np.array_equal(result, np.abs(inputs))
+
+
+def test_quantize_rebuilds_copy_of_modified_model():
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "unary.onnx")
+        inputs = np.array([-1.0, 2.0], dtype=np.float32)
+
+        _write_unary_model(model_path, "Neg")
+        model = GizaModel(model_path=model_path, quantize=True)
+        result, _ = model.predict(input_feed={"x": inputs})
+        assert np.array_equal(result, -inputs)
+
+        _write_unary_model(model_path, "Abs")
+        stat = os.stat(model_path)
+        os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        model = GizaModel(model_path=model_path, quantize=True)
+        result, _ = model.predict(input_feed={"x": inputs})
+        assert np.array_equal(result, np.abs(inputs))
+
+
+def test_predict_local_quantized_session():
+    weights = np.random.default_rng(0).normal(size=(8, 4)).astype(np.float32)
+    x = onnx.helper.make_tensor_value_info("x", onnx.TensorProto.FLOAT, [None, 8])
+    out = onnx.helper.make_tensor_value_info("out", onnx.TensorProto.FLOAT, [None, 4])
+    graph = onnx.helper.make_graph(
+        [onnx.helper.make_node("MatMul", ["x", "w"], ["out"])],
+        "matmul",
+        [x],
+        [out],
+        [onnx.numpy_helper.from_array(weights, "w")],
+    )
+    model = onnx.helper.make_model(
+        graph, opset_imports=[onnx.helper.make_opsetid("", 13)]
+    )
+    model.ir_version = 8
+
+    with tempfile.TemporaryDirectory() as tempdir:
+        model_path = os.path.join(tempdir, "matmul.onnx")
+        onnx.save(model, model_path)
+
+        quantized = GizaModel(model_path=model_path, quantize=True)
+        assert os.path.exists(os.path.join(tempdir, "matmul.int8.onnx"))
+        assert quantized.session is not GizaModel(model_path=model_path).session
+
+        inputs = np.ones((2, 8), dtype=np.float32)
+        result, _ = quantized.predict(input_feed={"x": inputs})
+        np.testing.assert_allclose(result, inputs @ weights, atol=0.1)
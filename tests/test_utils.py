@@ -1,12 +1,20 @@
+import os
 from unittest import mock
 from unittest.mock import patch
 
 import pytest
 import requests
+from giza.cli.client import EndpointsClient, JobsClient
 from giza.cli.schemas.endpoints import Endpoint, EndpointsList
 from giza.cli.schemas.workspaces import Workspace
 
-from giza.agents.utils import get_endpoint_uri, get_workspace_uri, read_json
+from giza.agents.utils import (
+    create_client,
+    get_endpoint_uri,
+    get_session,
+    get_workspace_uri,
+    read_json,
+)
 
 
 @patch("giza.cli.client.EndpointsClient.list")
@@ -82,3 +90,34 @@ def test_read_json_file_not_found(mock_open):
     """
     with pytest.raises(FileNotFoundError):
         read_json("/notFound/")
+
+
+def test_create_client_shares_session():
+    """
+    Tests that the clients created share the same HTTP session.
+    """
+    endpoints_client = create_client(EndpointsClient)
+    jobs_client = create_client(JobsClient)
+
+    assert isinstance(endpoints_client, EndpointsClient)
+    assert isinstance(jobs_client, JobsClient)
+    assert endpoints_client.session is get_session()
+    assert jobs_client.session is get_session()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_get_session_drops_connections_after_fork():
+    """
+    Tests that a forked child does not reuse the connections of its parent.
+    """
+    adapter = get_session().get_adapter("https://")
+    adapter.poolmanager.connection_from_url("https://localhost")
+
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if len(adapter.poolmanager.pools) == 0 else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert len(adapter.poolmanager.pools) == 1
+    adapter.poolmanager.clear()